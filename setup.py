@@ -11,6 +11,7 @@ setup(
         "sqlalchemy>=2.0.0",
         "pydantic>=2.0.0",
         "python-frontmatter>=1.0.0",
+        "pyyaml>=5.1",
         "markdown>=3.4.0",
         "python-dotenv>=1.0.0",
     ],
@@ -21,6 +22,7 @@ setup(
             "black>=23.0.0",
             "isort>=5.12.0",
             "mypy>=1.0.0",
+            "types-PyYAML>=6.0.0",
         ],
     },
     entry_points={
@@ -1,15 +1,23 @@
 """SQLAlchemy database models for the Zettelkasten MCP server."""
 import datetime
+import logging
 from typing import List, Optional
 
-from sqlalchemy import (Column, DateTime, ForeignKey, Integer, String, Table,
-                       Text, UniqueConstraint, create_engine)
+from sqlalchemy import (Column, DateTime, ForeignKey, Index, Integer, String,
+                       Table, Text, UniqueConstraint, column, create_engine,
+                       event, inspect, table, text)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.engine.interfaces import DBAPIConnection
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Mapped, Session, declarative_base, relationship, sessionmaker
+from sqlalchemy.pool import ConnectionPoolEntry
 
 from zettelkasten_mcp.config import config
 from zettelkasten_mcp.models.schema import LinkType, NoteType
 
+logger = logging.getLogger(__name__)
+
 # Create base class for SQLAlchemy models
 Base = declarative_base()
 
@@ -18,18 +26,24 @@ note_tags = Table(
     "note_tags",
     Base.metadata,
     Column("note_id", String(255), ForeignKey("notes.id"), primary_key=True),
-    Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True),
+    # The primary key serves lookups by note; this index those by tag
+    Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True, index=True),
 )
 
 class DBNote(Base):
     """Database model for a note."""
     __tablename__ = "notes"
-    id = Column(String(255), primary_key=True, index=True)
+    id = Column(String(255), primary_key=True)
     title = Column(String(255), nullable=False, index=True)
     content = Column(Text, nullable=False)
-    note_type = Column(String(50), default=NoteType.PERMANENT.value, nullable=False, index=True)
-    created_at = Column(DateTime, default=datetime.datetime.now, nullable=False)
-    updated_at = Column(DateTime, default=datetime.datetime.now, nullable=False)
+    note_type = Column(String(50), default=NoteType.PERMANENT.value, nullable=False)
+    created_at = Column(DateTime, default=datetime.datetime.now, nullable=False, index=True)
+    updated_at = Column(DateTime, default=datetime.datetime.now, nullable=False, index=True)
+    
+    # Filtering by type only needs note IDs, which this index covers
+    __table_args__ = (
+        Index("ix_notes_note_type_id", "note_type", "id"),
+    )
     
     # Relationships
     tags = relationship(
@@ -85,10 +99,12 @@ class DBLink(Base):
         "DBNote", foreign_keys=[target_id], back_populates="incoming_links"
     )
     
-    # Add a unique constraint to prevent duplicate links of the same type
+    # Add a unique constraint to prevent duplicate links of the same type;
+    # it also serves lookups by source, and the index covers those by target
     __table_args__ = (
         UniqueConstraint('source_id', 'target_id', 'link_type', 
                          name='unique_link_type'),
+        Index("ix_links_target_id_source_id", "target_id", "source_id"),
     )
     
     def __repr__(self) -> str:
@@ -98,15 +114,130 @@ class DBLink(Base):
             f"target='{self.target_id}', type='{self.link_type}')>"
         )
 
-def init_db() -> None:
+# Full-text index over note titles and contents. The trigram tokenizer finds
+# any substring of three or more characters, as LIKE '%...%' does, and with
+# external content the text itself is only stored in the notes table
+notes_fts = table("notes_fts", column("rowid", Integer), column("title"), column("content"))
+
+_FTS_TABLE_DDL = (
+    "CREATE VIRTUAL TABLE notes_fts USING fts5("
+    "title, content, content='notes', content_rowid='rowid', tokenize='trigram')"
+)
+
+# Triggers keeping the full-text index in step with the notes table
+_FTS_TRIGGERS_DDL = {
+    "notes_fts_insert": """
+        CREATE TRIGGER notes_fts_insert AFTER INSERT ON notes BEGIN
+            INSERT INTO notes_fts(rowid, title, content)
+            VALUES (new.rowid, new.title, new.content);
+        END""",
+    "notes_fts_delete": """
+        CREATE TRIGGER notes_fts_delete AFTER DELETE ON notes BEGIN
+            INSERT INTO notes_fts(notes_fts, rowid, title, content)
+            VALUES ('delete', old.rowid, old.title, old.content);
+        END""",
+    "notes_fts_update": """
+        CREATE TRIGGER notes_fts_update AFTER UPDATE ON notes BEGIN
+            INSERT INTO notes_fts(notes_fts, rowid, title, content)
+            VALUES ('delete', old.rowid, old.title, old.content);
+            INSERT INTO notes_fts(rowid, title, content)
+            VALUES (new.rowid, new.title, new.content);
+        END""",
+}
+
+# Indexes earlier versions created that are redundant with the primary key or
+# replaced by the covering indexes above
+_REPLACED_INDEXES = ("ix_notes_id", "ix_notes_note_type")
+
+def has_fts_index(engine: Engine) -> bool:
+    """Check whether the database has the full-text index."""
+    return inspect(engine).has_table("notes_fts")
+
+def create_fts_triggers(connection: Connection) -> None:
+    """Create the triggers that keep the full-text index up to date."""
+    for ddl in _FTS_TRIGGERS_DDL.values():
+        connection.execute(text(ddl))
+
+def drop_fts_triggers(connection: Connection) -> None:
+    """Drop the full-text index triggers, e.g. while notes are bulk loaded."""
+    for name in _FTS_TRIGGERS_DDL:
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+
+def rebuild_fts_index(connection: Connection) -> None:
+    """Rebuild the full-text index from the notes table."""
+    connection.execute(text("INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')"))
+
+def _init_fts_index(engine: Engine) -> None:
+    """Create and fill the full-text index if the database lacks it."""
+    if has_fts_index(engine):
+        return
+    try:
+        with engine.begin() as connection:
+            connection.execute(text(_FTS_TABLE_DDL))
+            create_fts_triggers(connection)
+            rebuild_fts_index(connection)
+    except OperationalError as e:
+        # FTS5 and its trigram tokenizer (SQLite 3.34+) are optional parts of
+        # SQLite; without them searches scan the notes table instead
+        logger.warning(f"Full-text index unavailable: {e}")
+
+def _set_sqlite_pragmas(
+    dbapi_connection: DBAPIConnection, connection_record: ConnectionPoolEntry
+) -> None:
+    """Apply SQLite settings to each new connection."""
+    cursor = dbapi_connection.cursor()
+    # Write-ahead logging lets reads run alongside a write, and with
+    # synchronous=NORMAL a commit no longer waits for an fsync; the index can
+    # always be rebuilt from the note files if the last commits are lost
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    # Keep temporary tables and indices in memory and allow a 64 MiB page
+    # cache, which keeps index rebuilds and bulk inserts off the disk
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    # Read the database file through a memory map of up to 256 MiB rather
+    # than copying pages into the cache with read() calls
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+def _optimize_sqlite(
+    dbapi_connection: DBAPIConnection, connection_record: ConnectionPoolEntry
+) -> None:
+    """Let SQLite refresh its planner statistics before a connection closes."""
+    # PRAGMA optimize only runs ANALYZE on tables whose statistics it
+    # considers stale, so it is cheap when little has changed
+    try:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA optimize")
+        cursor.close()
+    except Exception as e:
+        logger.debug(f"PRAGMA optimize failed: {e}")
+
+def create_db_engine() -> Engine:
+    """Create a database engine with the SQLite connection settings applied."""
+    engine = create_engine(config.get_db_url())
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(engine, "close", _optimize_sqlite)
+    return engine
+
+def init_db() -> Engine:
     """Initialize the database."""
     # Create engine based on configuration
-    engine = create_engine(config.get_db_url())
+    engine = create_db_engine()
     Base.metadata.create_all(engine)
+    # create_all() skips tables that already exist, so add any indexes
+    # introduced after the database was first created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    with engine.begin() as connection:
+        for name in _REPLACED_INDEXES:
+            connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    _init_fts_index(engine)
     return engine
 
 def get_session_factory(engine=None):
     """Get a session factory for the database."""
     if engine is None:
-        engine = create_engine(config.get_db_url())
+        engine = create_db_engine()
     return sessionmaker(bind=engine)
@@ -6,7 +6,7 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 from sqlalchemy import exc as sqlalchemy_exc
 from mcp.server.fastmcp import Context, FastMCP
 from zettelkasten_mcp.config import config
-from zettelkasten_mcp.models.schema import LinkType, Note, NoteType, Tag
+from zettelkasten_mcp.models.schema import Link, LinkType, Note, NoteType, Tag
 from zettelkasten_mcp.services.search_service import SearchService
 from zettelkasten_mcp.services.zettel_service import ZettelService
 
@@ -348,6 +348,16 @@ class ZettelkastenMcpServer:
                 linked_notes = self.zettel_service.get_linked_notes(str(note_id), direction)
                 if not linked_notes:
                     return f"No {direction} links found for note {note_id}."
+                # Load the source note once and index its outgoing links by
+                # target, keeping the first link to each, rather than reading
+                # the source file again for every linked note
+                outgoing_links: Dict[str, Link] = {}
+                if direction in ["outgoing", "both"]:
+                    source_note = self.zettel_service.get_note(str(note_id))
+                    if source_note:
+                        for link in source_note.links:
+                            # Keyed by string ID, as the lookup below is
+                            outgoing_links.setdefault(str(link.target_id), link)
                 # Format results
                 output = f"Found {len(linked_notes)} {direction} linked notes for {note_id}:\n\n"
                 for i, note in enumerate(linked_notes, 1):
@@ -357,14 +367,11 @@ class ZettelkastenMcpServer:
                     # Try to determine link type
                     if direction in ["outgoing", "both"]:
                         # Check source note's outgoing links
-                        source_note = self.zettel_service.get_note(str(note_id))
-                        if source_note:
-                            for link in source_note.links:
-                                if str(link.target_id) == str(note.id):  # Explicit string conversion for comparison
-                                    output += f"   Link type: {link.link_type.value}\n"
-                                    if link.description:
-                                        output += f"   Description: {link.description}\n"
-                                    break
+                        link = outgoing_links.get(str(note.id))
+                        if link:
+                            output += f"   Link type: {link.link_type.value}\n"
+                            if link.description:
+                                output += f"   Description: {link.description}\n"
                     if direction in ["incoming", "both"]:
                         # Check target note's outgoing links
                         for link in note.links:
@@ -521,11 +528,10 @@ class ZettelkastenMcpServer:
                 notes = self.search_service.find_notes_by_date_range(
                     start_date=start_datetime,
                     end_date=end_datetime,
-                    use_updated=use_updated
+                    use_updated=use_updated,
+                    limit=limit
                 )
                 
-                # Limit results
-                notes = notes[:limit]
                 if not notes:
                     date_type = "updated" if use_updated else "created"
                     date_range = ""
@@ -572,14 +578,15 @@ class ZettelkastenMcpServer:
         def zk_rebuild_index() -> str:
             """Rebuild the database index from files."""
             try:
-                # Get count before rebuild
-                note_count_before = len(self.zettel_service.get_all_notes())
+                # Get count before rebuild; counting in the index avoids
+                # reading every note file just to take its length
+                note_count_before = self.zettel_service.count_notes()
                 
                 # Perform the rebuild
                 self.zettel_service.rebuild_index()
                 
                 # Get count after rebuild
-                note_count_after = len(self.zettel_service.get_all_notes())
+                note_count_after = self.zettel_service.count_notes()
                 
                 # Return a detailed success message
                 return (
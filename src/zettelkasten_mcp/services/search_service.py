@@ -1,14 +1,12 @@
 """Service for searching and discovering notes in the Zettelkasten."""
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Set, Tuple, Union
-from sqlalchemy import func, select, text
+from sqlalchemy import exists, func, select, text
 
 from zettelkasten_mcp.models.schema import LinkType, Note, NoteType, Tag
 from zettelkasten_mcp.services.zettel_service import ZettelService
 
-from sqlalchemy import or_
-from sqlalchemy.orm import joinedload
 from zettelkasten_mcp.models.db_models import DBLink, DBNote
 
 @dataclass
@@ -42,11 +40,10 @@ class SearchService:
         query = query.lower()
         query_terms = set(query.split())
         
-        # Get all notes
-        all_notes = self.zettel_service.get_all_notes()
+        # Stream all notes, so only the matches are kept in memory
         results = []
         
-        for note in all_notes:
+        for note in self.zettel_service.iter_all_notes():
             score = 0.0
             matched_terms: Set[str] = set()
             matched_context = ""
@@ -102,14 +99,11 @@ class SearchService:
         if isinstance(tags, str):
             return self.zettel_service.get_notes_by_tag(tags)
         else:
-            # If we have multiple tags, find notes with any of the tags
-            all_matching_notes = []
-            for tag in tags:
-                notes = self.zettel_service.get_notes_by_tag(tag)
-                all_matching_notes.extend(notes)
-            # Remove duplicates by converting to a dictionary by ID
-            unique_notes = {note.id: note for note in all_matching_notes}
-            return list(unique_notes.values())
+            # If we have multiple tags, find notes with any of the tags in a
+            # single query; the repository removes duplicates from the join
+            if not tags:
+                return []
+            return self.zettel_service.search_notes(tags=list(tags))
     
     def search_by_link(self, note_id: str, direction: str = "both") -> List[Note]:
         """Search for notes linked to/from a note."""
@@ -120,40 +114,20 @@ class SearchService:
         orphans = []
         
         with self.zettel_service.repository.session_factory() as session:
-            # Subquery for notes with links
-            notes_with_links = (
-                select(DBNote.id)
-                .outerjoin(DBLink, or_(
-                    DBNote.id == DBLink.source_id,
-                    DBNote.id == DBLink.target_id
-                ))
-                .where(or_(
-                    DBLink.source_id != None,
-                    DBLink.target_id != None
-                ))
-                .subquery()
+            # Anti-join against links in both directions; each NOT EXISTS can
+            # stop at the first matching link
+            query = select(DBNote.id).where(
+                ~exists().where(DBLink.source_id == DBNote.id),
+                ~exists().where(DBLink.target_id == DBNote.id)
             )
-            
-            # Query for notes without links
-            query = (
-                select(DBNote)
-                .options(
-                    joinedload(DBNote.tags),
-                    joinedload(DBNote.outgoing_links),
-                    joinedload(DBNote.incoming_links)
-                )
-                .where(DBNote.id.not_in(select(notes_with_links)))
-            )
-            
-            result = session.execute(query)
-            orphaned_db_notes = result.unique().scalars().all()
-            
-            # Convert DB notes to model Notes
-            for db_note in orphaned_db_notes:
-                note = self.zettel_service.get_note(db_note.id)
-                if note:
-                    orphans.append(note)
-                    
+            orphan_ids = session.scalars(query).all()
+        
+        # Convert DB notes to model Notes
+        for note_id in orphan_ids:
+            note = self.zettel_service.get_note(note_id)
+            if note:
+                orphans.append(note)
+        
         return orphans
     
     def find_central_notes(self, limit: int = 10) -> List[Tuple[Note, int]]:
@@ -205,23 +179,22 @@ class SearchService:
         self,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        use_updated: bool = False
+        use_updated: bool = False,
+        limit: Optional[int] = None
     ) -> List[Note]:
-        """Find notes created or updated within a date range."""
-        all_notes = self.zettel_service.get_all_notes()
-        matching_notes = []
-        
-        for note in all_notes:
-            # Get the relevant date
-            date = note.updated_at if use_updated else note.created_at
-            
-            # Check if in range
-            if start_date and date < start_date:
-                continue
-            if end_date and date >= end_date + datetime.timedelta(seconds=1):
-                continue
-            
-            matching_notes.append(note)
+        """Find notes created or updated within a date range, newest first."""
+        # Let the database apply the range, order and limit so only the
+        # returned notes are loaded
+        field = "updated" if use_updated else "created"
+        criteria: Dict[str, Any] = {"newest_by": field}
+        if limit is not None:
+            criteria["limit"] = limit
+        if start_date:
+            criteria[f"{field}_after"] = start_date
+        if end_date:
+            # Include the whole final second of the range
+            criteria[f"{field}_before"] = end_date + timedelta(microseconds=999999)
+        matching_notes = self.zettel_service.search_notes(**criteria)
         
         # Sort by date (descending)
         matching_notes.sort(
@@ -244,30 +217,18 @@ class SearchService:
         end_date: Optional[datetime] = None,
     ) -> List[SearchResult]:
         """Perform a combined search with multiple criteria."""
-        # Start with all notes
-        all_notes = self.zettel_service.get_all_notes()
-        
-        # Filter by criteria
-        filtered_notes = []
-        for note in all_notes:
-            # Check note type
-            if note_type and note.note_type != note_type:
-                continue
-            
-            # Check date range
-            if start_date and note.created_at < start_date:
-                continue
-            if end_date and note.created_at > end_date:
-                continue
-            
-            # Check tags
-            if tags:
-                note_tag_names = {tag.name for tag in note.tags}
-                if not any(tag in note_tag_names for tag in tags):
-                    continue
-            
-            # Made it through all filters
-            filtered_notes.append(note)
+        # Let the database filter by type, date range and tags so only
+        # matching notes are loaded
+        criteria: Dict[str, Any] = {}
+        if note_type:
+            criteria["note_type"] = note_type
+        if start_date:
+            criteria["created_after"] = start_date
+        if end_date:
+            criteria["created_before"] = end_date
+        if tags:
+            criteria["tags"] = list(tags)
+        filtered_notes = self.zettel_service.search_notes(**criteria)
         
         # If we have a text query, score the notes
         results = []
@@ -1,8 +1,7 @@
 """Service layer for Zettelkasten operations."""
-import datetime
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from zettelkasten_mcp.config import config
 from zettelkasten_mcp.models.schema import Link, LinkType, Note, NoteType, Tag
@@ -83,9 +82,7 @@ class ZettelService:
         if metadata is not None:
             note.metadata = metadata
         
-        note.updated_at = datetime.datetime.now()
-        
-        # Save to repository
+        # Save to repository, which sets the updated timestamp
         return self.repository.update(note)
     
     def delete_note(self, note_id: str) -> None:
@@ -96,6 +93,14 @@ class ZettelService:
         """Get all notes."""
         return self.repository.get_all()
     
+    def iter_all_notes(self) -> Iterator[Note]:
+        """Iterate over all notes without loading them all at once."""
+        return self.repository.iter_all()
+    
+    def count_notes(self) -> int:
+        """Count all notes."""
+        return self.repository.count()
+    
     def search_notes(self, **kwargs: Any) -> List[Note]:
         """Search for notes based on criteria."""
         return self.repository.search(**kwargs)
@@ -109,6 +114,9 @@ class ZettelService:
         note = self.repository.get(note_id)
         if not note:
             raise ValueError(f"Note with ID {note_id} not found")
+        # Leave the file and index alone if the note already has the tag
+        if any(t.name == tag for t in note.tags):
+            return note
         note.add_tag(tag)
         return self.repository.update(note)
     
@@ -117,6 +125,9 @@ class ZettelService:
         note = self.repository.get(note_id)
         if not note:
             raise ValueError(f"Note with ID {note_id} not found")
+        # Leave the file and index alone if the note does not have the tag
+        if not any(t.name == tag for t in note.tags):
+            return note
         note.remove_tag(tag)
         return self.repository.update(note)
     
@@ -212,20 +223,31 @@ class ZettelService:
         if not source_note:
             raise ValueError(f"Source note with ID {source_id} not found")
         
-        # Remove link from source to target
-        source_note.remove_link(target_id, link_type)
-        source_note = self.repository.update(source_note)
+        # Remove link from source to target; a note is only rewritten if it
+        # actually had a matching link
+        if self._has_link(source_note, target_id, link_type):
+            source_note.remove_link(target_id, link_type)
+            source_note = self.repository.update(source_note)
         
         # If bidirectional, remove link from target to source
         reverse_note = None
         if bidirectional:
             target_note = self.repository.get(target_id)
             if target_note:
-                target_note.remove_link(source_id, link_type)
-                reverse_note = self.repository.update(target_note)
+                if self._has_link(target_note, source_id, link_type):
+                    target_note.remove_link(source_id, link_type)
+                    target_note = self.repository.update(target_note)
+                reverse_note = target_note
         
         return source_note, reverse_note
     
+    def _has_link(self, note: Note, target_id: str, link_type: Optional[LinkType] = None) -> bool:
+        """Check whether a note links to a target, optionally with a given type."""
+        return any(
+            link.target_id == target_id and (not link_type or link.link_type == link_type)
+            for link in note.links
+        )
+    
     def get_linked_notes(
         self, note_id: str, direction: str = "outgoing"
     ) -> List[Note]:
@@ -256,8 +278,11 @@ class ZettelService:
         if not note:
             raise ValueError(f"Note with ID {note_id} not found")
         
-        # Get all notes
-        all_notes = self.repository.get_all()
+        # Score notes from their IDs, tag names and link targets in the index,
+        # so only the notes that pass the threshold are loaded from disk
+        all_ids = self.repository.get_all_ids()
+        tags_by_note = self.repository.get_tag_names_by_note()
+        links_by_note = self.repository.get_link_targets_by_note()
         results = []
         
         # Set of this note's tags and links
@@ -265,27 +290,29 @@ class ZettelService:
         note_links = {link.target_id for link in note.links}
         
         # Add notes linked to this note
-        incoming_notes = self.repository.find_linked_notes(note_id, "incoming")
-        note_incoming = {n.id for n in incoming_notes}
+        note_incoming = {
+            source_id for source_id, targets in links_by_note.items()
+            if note_id in targets
+        }
         
         # For each note, calculate similarity
-        for other_note in all_notes:
-            if other_note.id == note_id:
+        for other_id in all_ids:
+            if other_id == note_id:
                 continue
             
             # Calculate tag overlap
-            other_tags = {tag.name for tag in other_note.tags}
+            other_tags = tags_by_note.get(other_id, set())
             tag_overlap = len(note_tags.intersection(other_tags))
             
             # Calculate link overlap (outgoing)
-            other_links = {link.target_id for link in other_note.links}
+            other_links = links_by_note.get(other_id, set())
             link_overlap = len(note_links.intersection(other_links))
             
             # Check if other note links to this note
-            incoming_overlap = 1 if other_note.id in note_incoming else 0
+            incoming_overlap = 1 if other_id in note_incoming else 0
             
             # Check if this note links to other note
-            outgoing_overlap = 1 if other_note.id in note_links else 0
+            outgoing_overlap = 1 if other_id in note_links else 0
             
             # Calculate similarity score
             # Weight: 40% tags, 20% outgoing links, 20% incoming links, 20% direct connections
@@ -308,7 +335,14 @@ class ZettelService:
                 ) / total_possible
             
             if similarity >= threshold:
-                results.append((other_note, similarity))
+                try:
+                    other_note = self.repository.get(other_id)
+                except Exception as e:
+                    # Skip notes whose files can't be read, as get_all() does
+                    logger.error(f"Error loading note {other_id}: {e}")
+                    continue
+                if other_note:
+                    results.append((other_note, similarity))
         
         # Sort by similarity (descending)
         results.sort(key=lambda x: x[1], reverse=True)
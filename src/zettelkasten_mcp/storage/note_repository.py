@@ -1,23 +1,256 @@
 """Repository for note storage and retrieval."""
 import datetime
+import functools
 import logging
+import multiprocessing
 import os
+import re
+import sys
+import tempfile
 import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
-import frontmatter
-from sqlalchemy import and_, create_engine, func, or_, select, text
-from sqlalchemy.orm import Session, joinedload
+import yaml
+from sqlalchemy import (Select, create_engine, delete, exists, func, insert,
+                        literal_column, or_, select, text, union)
+from sqlalchemy.orm import Session
 
 from zettelkasten_mcp.config import config
 from zettelkasten_mcp.models.db_models import (Base, DBLink, DBNote, DBTag,
-                                            get_session_factory, init_db)
+                                            create_fts_triggers,
+                                            drop_fts_triggers,
+                                            get_session_factory, has_fts_index,
+                                            init_db, note_tags, notes_fts,
+                                            rebuild_fts_index)
 from zettelkasten_mcp.models.schema import Link, LinkType, Note, NoteType, Tag
 from zettelkasten_mcp.storage.base import Repository
 
 logger = logging.getLogger(__name__)
 
+# Frontmatter delimiter line, as python-frontmatter's YAML handler matches it
+_FRONTMATTER_BOUNDARY_RE = re.compile(r"^-{3,}\s*$", re.MULTILINE)
+# libyaml's C loader and emitter when PyYAML was built with them, which is
+# also what python-frontmatter picks
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# A "# " heading line, the title fallback for notes without a title
+_TITLE_HEADING_RE = re.compile(r"^# (.*)$", re.MULTILINE)
+
+# Headings that start and end a "## Links" section, matched per line
+_LINKS_HEADING_RE = re.compile(r"^[ \t]*## Links.*$", re.MULTILINE)
+_SECTION_HEADING_RE = re.compile(r"^[ \t]*## ", re.MULTILINE)
+
+# A line in the "## Links" section: - <type> [[<target id>]] <description>
+_LINK_LINE_RE = re.compile(
+    r"^[ \t]*- (?P<type>.*?)\[\[(?P<target>.*?)\]\](?P<description>.*)$",
+    re.MULTILINE
+)
+
+# Note and link types by their value, so parsing doesn't need NoteType() or
+# LinkType() and a try/except for unknown values
+_NOTE_TYPES_BY_VALUE = {note_type.value: note_type for note_type in NoteType}
+_LINK_TYPES_BY_VALUE = {link_type.value: link_type for link_type in LinkType}
+
+# Links-section line templates per link type, built once so writing links
+# avoids the Enum .value descriptor and re-formatting the type for every link
+_LINK_LINE_TEMPLATES = {
+    link_type: f"- {link_type.value} [[{{}}]]" for link_type in LinkType
+}
+_LINK_LINE_DESC_TEMPLATES = {
+    link_type: f"- {link_type.value} [[{{}}]] {{}}" for link_type in LinkType
+}
+
+# Frontmatter keys the repository manages itself; anything else is kept as
+# the note's custom metadata
+_RESERVED_METADATA_KEYS = frozenset(("id", "title", "type", "tags", "created", "updated"))
+
+# Tags are immutable, so notes parsed with the same tag share one instance
+# instead of each building and validating its own; the cache is bounded so
+# names of deleted or one-off tags don't accumulate for the process lifetime
+_TAG_CACHE_SIZE = 4096
+
+# Number of threads used to read note files while rebuilding the index
+_READ_WORKERS = 8
+
+# Rebuilds of at least this many files parse them in worker processes; below
+# it, starting the workers costs more than parsing on one core
+_PROCESS_PARSE_MIN_FILES = 1000
+# Worker processes are only used where they can be forked; macOS supports
+# fork but it is unsafe there, which is why Python defaults to spawn
+_FORK_AVAILABLE = (
+    "fork" in multiprocessing.get_all_start_methods() and sys.platform != "darwin"
+)
+
+# Temporary files are created private, so written notes are given the mode
+# open() would have created them with under the process umask
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_NOTE_FILE_MODE = 0o666 & ~_UMASK
+
+def _dump_frontmatter(metadata: Dict[str, Any]) -> str:
+    """Serialize note metadata as a YAML block, as frontmatter.dumps does."""
+    dumped: str = yaml.dump(
+        metadata, Dumper=_YAML_DUMPER, default_flow_style=False, allow_unicode=True
+    )
+    return dumped.rstrip("\n")
+
+@functools.lru_cache(maxsize=_TAG_CACHE_SIZE)
+def _get_tag(name: str) -> Tag:
+    """Get the shared Tag for a name, creating it on first use."""
+    return Tag(name=name)
+
+def _split_frontmatter(content: str) -> Tuple[Dict[str, Any], str]:
+    """Split markdown into frontmatter metadata and body.
+    YAML frontmatter is split and loaded directly, the same way
+    python-frontmatter does it but without building a Post; anything else
+    (JSON or TOML frontmatter, or none) is left to python-frontmatter.
+    """
+    text = content.replace("\r\n", "\n").strip()
+    opening = _FRONTMATTER_BOUNDARY_RE.match(text)
+    if not opening:
+        # Imported here since only these rare files need it, which keeps its
+        # handlers (and their json/toml imports) out of start-up
+        import frontmatter
+        post = frontmatter.loads(text)
+        return post.metadata, post.content
+    closing = _FRONTMATTER_BOUNDARY_RE.search(text, opening.end())
+    if not closing:
+        # An opening delimiter alone is not frontmatter
+        return {}, text
+    data = yaml.load(text[opening.end():closing.start()], Loader=_YAML_LOADER)
+    return (data if isinstance(data, dict) else {}), text[closing.end():].strip()
+
+def _parse_note_markdown(content: str) -> Note:
+    """Parse a note from markdown content.
+    Kept at module level so worker processes can run it during rebuilds.
+    """
+    # Parse frontmatter
+    metadata, content = _split_frontmatter(content)
+    
+    # Extract ID from metadata or filename
+    note_id = metadata.get("id")
+    if not note_id:
+        raise ValueError("Note ID missing from frontmatter")
+    
+    # Extract title from metadata or first heading
+    title = metadata.get("title")
+    if not title:
+        # Try to extract from content
+        match = _TITLE_HEADING_RE.search(content.lstrip())
+        if match:
+            title = match.group(1).strip()
+    if not title:
+        raise ValueError("Note title missing from frontmatter or content")
+    
+    # Extract note type
+    note_type_str = metadata.get("type", NoteType.PERMANENT.value)
+    # Unknown or non-string types fall back to permanent
+    note_type = (
+        _NOTE_TYPES_BY_VALUE.get(note_type_str, NoteType.PERMANENT)
+        if isinstance(note_type_str, str)
+        else NoteType.PERMANENT
+    )
+    
+    # One timestamp serves every default in this note: link creation times
+    # and a missing created date
+    now = datetime.datetime.now()
+    
+    # Extract tags
+    tags_str = metadata.get("tags", "")
+    # Each name is converted and stripped once, and str() is skipped for the
+    # usual case of names that YAML already loaded as strings
+    if isinstance(tags_str, str):
+        tag_names = [name for t in tags_str.split(",") if (name := t.strip())]
+    elif isinstance(tags_str, list):
+        tag_names = [
+            name for t in tags_str
+            if (name := (t if type(t) is str else str(t)).strip())
+        ]
+    else:
+        tag_names = []
+    tags = [_get_tag(name) for name in tag_names]
+    
+    # Extract links from each Links section with the compiled patterns,
+    # instead of stepping through the content line by line
+    links = []
+    heading = _LINKS_HEADING_RE.search(content)
+    while heading:
+        # A section runs until the next level-two heading
+        start = heading.end()
+        next_heading = _SECTION_HEADING_RE.search(content, start)
+        end = next_heading.start() if next_heading else len(content)
+        # Example format: - reference [[202101010000]] Optional description
+        for match in _LINK_LINE_RE.finditer(content, start, end):
+            try:
+                # If not a valid type, default to reference
+                link_type = _LINK_TYPES_BY_VALUE.get(
+                    match.group("type").strip(), LinkType.REFERENCE
+                )
+                links.append(
+                    Link(
+                        source_id=note_id,
+                        target_id=match.group("target").strip(),
+                        link_type=link_type,
+                        description=match.group("description").strip(),
+                        created_at=now
+                    )
+                )
+            except Exception as e:
+                logger.error(f"Error parsing link: {match.group(0).strip()} - {e}")
+        heading = _LINKS_HEADING_RE.search(content, end)
+    
+    # Extract timestamps
+    created_str = metadata.get("created")
+    created_at = (
+        datetime.datetime.fromisoformat(created_str)
+        if created_str
+        else now
+    )
+    updated_str = metadata.get("updated")
+    # Notes that were never edited carry the same string twice
+    updated_at = (
+        datetime.datetime.fromisoformat(updated_str)
+        if updated_str and updated_str != created_str
+        else created_at
+    )
+    
+    # Create note object
+    return Note(
+        id=note_id,
+        title=title,
+        content=content,
+        note_type=note_type,
+        tags=tags,
+        links=links,
+        created_at=created_at,
+        updated_at=updated_at,
+        metadata={k: v for k, v in metadata.items() if k not in _RESERVED_METADATA_KEYS}
+    )
+
+def _read_note_text(file_path: Path) -> str:
+    """Read the markdown content of a note file."""
+    # Reading bytes and decoding once skips the text layer's incremental
+    # decoding; CRLF line endings are normalized when the text is parsed.
+    # The whole file is read in one go, so an unbuffered file object also
+    # skips allocating a read buffer
+    with open(file_path, "rb", buffering=0) as f:
+        return f.read().decode("utf-8")
+
+def _like_pattern(term: str) -> str:
+    """Build a LIKE pattern for a term anywhere in the text.
+    LIKE wildcards in the term are escaped with a backslash, so they match
+    literally; conditions using the pattern need escape="\\".
+    """
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def _load_note_file(file_path: Path) -> Note:
+    """Read and parse a note file."""
+    return _parse_note_markdown(_read_note_text(file_path))
+
 class NoteRepository(Repository[Note]):
     """Repository for note storage and retrieval.
     This implements a dual storage approach:
@@ -40,6 +273,7 @@ class NoteRepository(Repository[Note]):
         # Initialize database
         self.engine = init_db()
         self.session_factory = get_session_factory(self.engine)
+        self.fts_enabled = has_fts_index(self.engine)
         
         # File access lock
         self.file_lock = threading.RLock()
@@ -54,227 +288,212 @@ class NoteRepository(Repository[Note]):
             db_count = session.scalar(select(text("COUNT(*)")).select_from(DBNote))
         
         # Count note files
-        file_count = len(list(self.notes_dir.glob("*.md")))
+        file_count = sum(1 for _ in self._scan_note_files())
         
         # Rebuild if counts don't match
         if db_count != file_count:
             self.rebuild_index()
     
+    def _scan_note_files(self) -> Iterator[os.DirEntry]:
+        """Yield the directory entries of all note files.
+        os.scandir() avoids building a Path and matching a pattern for every
+        entry the way glob() does, and usually needs no extra stat call.
+        """
+        with os.scandir(self.notes_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".md") and entry.is_file():
+                    yield entry
+    
     def rebuild_index(self) -> None:
         """Rebuild the database index from all markdown files."""
-        # Clear the database first
-        with self.session_factory() as session:
+        # Read all markdown files
+        note_files = [Path(entry.path) for entry in self._scan_note_files()]
+        
+        # The executor is set up before the session so that any worker
+        # processes are forked before the database transaction begins.
+        # The whole rebuild runs in one transaction: SQLite syncs to disk once
+        # at the commit instead of once per batch, and if anything fails the
+        # previous index is left as it was
+        with self._rebuild_executor(len(note_files)) as executor, \
+                self.session_factory() as session:
+            # Drop the secondary indexes while the tables are cleared and
+            # filled, and create them again afterwards; building each index
+            # once from the full table is cheaper than updating it for every
+            # deleted and inserted row
+            secondary_indexes = [
+                index for table in Base.metadata.sorted_tables
+                for index in table.indexes
+            ]
+            connection = session.connection()
+            for index in secondary_indexes:
+                index.drop(connection, checkfirst=True)
+            # Likewise the full-text index is rebuilt in one pass at the end
+            # rather than by a trigger for every deleted and inserted row
+            if self.fts_enabled:
+                drop_fts_triggers(connection)
+            
+            # Clear the database first
             # Delete all records from link table
             session.execute(text("DELETE FROM links"))
             # Delete all records from note_tags table
             session.execute(text("DELETE FROM note_tags"))
             # Delete all records from notes table
             session.execute(text("DELETE FROM notes"))
-            # Commit changes
-            session.commit()
-        
-        # Read all markdown files
-        note_files = list(self.notes_dir.glob("*.md"))
-        
-        # Process files in batches to avoid memory issues with large Zettelkasten systems
-        batch_size = 100
-        for i in range(0, len(note_files), batch_size):
-            batch = note_files[i:i + batch_size]
-            notes = []
             
-            # Read files
-            for file_path in batch:
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-                    note = self._parse_note_from_markdown(content)
-                    notes.append(note)
-                except Exception as e:
-                    logger.error(f"Error processing file {file_path}: {e}")
+            # Process files in batches to avoid memory issues with large Zettelkasten systems
+            batch_size = 100
+            # The next batch is submitted before the current one is
+            # indexed, so files load while the database is busy; no more
+            # than two batches are held at once
+            pending = []
+            # The index starts empty, so tracking the IDs written so far
+            # replaces a lookup query per batch when checking duplicates
+            indexed_ids: Set[str] = set()
+            # Tags repeat across notes, so each one is looked up or
+            # created once for the whole rebuild rather than per batch
+            tag_ids: Dict[str, int] = {}
+            for i in range(0, len(note_files), batch_size):
+                batch = note_files[i:i + batch_size]
+                loads = [executor.submit(_load_note_file, path) for path in batch]
+                pending.append((batch, loads))
+                if len(pending) > 1:
+                    # Index notes
+                    notes = self._collect_notes(*pending.pop(0))
+                    self._index_notes(session, notes, indexed_ids, tag_ids)
+            for batch, loads in pending:
+                self._index_notes(
+                    session, self._collect_notes(batch, loads), indexed_ids, tag_ids
+                )
+            
+            for index in secondary_indexes:
+                index.create(connection)
+            if self.fts_enabled:
+                rebuild_fts_index(connection)
+                create_fts_triggers(connection)
+            # Gather statistics on the fresh tables and indexes so the query
+            # planner picks index lookups for tag and link joins
+            session.execute(text("ANALYZE"))
             
-            # Index notes
-            for note in notes:
-                self._index_note(note)
+            # Commit changes
+            session.commit()
     
-    def _parse_note_from_markdown(self, content: str) -> Note:
-        """Parse a note from markdown content."""
-        # Parse frontmatter
-        post = frontmatter.loads(content)
-        metadata = post.metadata
-        
-        # Extract ID from metadata or filename
-        note_id = metadata.get("id")
-        if not note_id:
-            raise ValueError("Note ID missing from frontmatter")
-        
-        # Extract title from metadata or first heading
-        title = metadata.get("title")
-        if not title:
-            # Try to extract from content
-            lines = post.content.strip().split("\n")
-            for line in lines:
-                if line.startswith("# "):
-                    title = line[2:].strip()
-                    break
-        if not title:
-            raise ValueError("Note title missing from frontmatter or content")
-        
-        # Extract note type
-        note_type_str = metadata.get("type", NoteType.PERMANENT.value)
-        try:
-            note_type = NoteType(note_type_str)
-        except ValueError:
-            note_type = NoteType.PERMANENT
-        
-        # Extract tags
-        tags_str = metadata.get("tags", "")
-        if isinstance(tags_str, str):
-            tag_names = [t.strip() for t in tags_str.split(",") if t.strip()]
-        elif isinstance(tags_str, list):
-            tag_names = [str(t).strip() for t in tags_str if str(t).strip()]
+    def _collect_notes(self, batch: List[Path], loads: List[Future]) -> List[Note]:
+        """Collect loaded notes in file order, logging files that failed."""
+        notes = []
+        for file_path, load in zip(batch, loads):
+            try:
+                notes.append(load.result())
+            except Exception as e:
+                logger.error(f"Error processing file {file_path}: {e}")
+        return notes
+    
+    def _rebuild_executor(self, file_count: int) -> Union[ProcessPoolExecutor, ThreadPoolExecutor]:
+        """Create the executor that loads note files during a rebuild."""
+        cpu_count = os.cpu_count() or 1
+        # Forking with other threads alive, such as the MCP server's worker
+        # threads, can leave a lock held in the children by a thread that no
+        # longer exists there
+        if (file_count >= _PROCESS_PARSE_MIN_FILES and cpu_count > 1
+                and _FORK_AVAILABLE and threading.active_count() == 1):
+            # Parsing is CPU bound, so large rebuilds spread it over processes.
+            # Forked workers start without re-importing the caller's main
+            # module, which spawned ones need to be able to do safely
+            executor = ProcessPoolExecutor(
+                max_workers=cpu_count,
+                mp_context=multiprocessing.get_context("fork")
+            )
+            # Workers are forked on the first submit; start them now, while
+            # the caller holds no database connection or transaction
+            executor.submit(int).result()
+            return executor
+        # File reads release the GIL, so a small thread pool keeps several in
+        # flight while others are being parsed
+        return ThreadPoolExecutor(max_workers=_READ_WORKERS)
+    
+    def _index_notes(
+        self, session: Session, notes: List[Note], indexed_ids: Optional[Set[str]] = None,
+        known_tag_ids: Optional[Dict[str, int]] = None
+    ) -> None:
+        """Index a batch of notes in the database using bulk inserts.
+        Runs in the caller's session and leaves committing to the caller.
+        Callers that know every ID already in the index can pass them as
+        indexed_ids to skip the lookup; the set is updated with the batch.
+        Tag IDs passed in known_tag_ids aren't looked up again, and the tags
+        resolved for the batch are added to it.
+        """
+        # Later notes with the same ID replace earlier ones
+        batch = {note.id: note for note in notes}
+        if not batch:
+            return
+        if indexed_ids is None:
+            existing_ids = list(session.scalars(
+                select(DBNote.id).where(DBNote.id.in_(batch))
+            ))
         else:
-            tag_names = []
-        tags = [Tag(name=name) for name in tag_names]
+            existing_ids = [note_id for note_id in batch if note_id in indexed_ids]
+            indexed_ids.update(batch)
+        if existing_ids:
+            # Clear rows left by an earlier file with the same ID so the batch
+            # can be inserted as new notes
+            session.execute(delete(DBLink).where(DBLink.source_id.in_(existing_ids)))
+            session.execute(note_tags.delete().where(note_tags.c.note_id.in_(existing_ids)))
+            session.execute(delete(DBNote).where(DBNote.id.in_(existing_ids)))
         
-        # Extract links
-        links = []
-        links_section = False
-        for line in post.content.split("\n"):
-            line = line.strip()
-            # Check if we're in the links section
-            if line.startswith("## Links"):
-                links_section = True
-                continue
-            if links_section and line.startswith("## "):
-                # We've reached the next section
-                links_section = False
-                continue
-            if links_section and line.startswith("- "):
-                # Parse link line
-                try:
-                    # Example format: - reference [[202101010000]] Optional description
-                    line_content = line.strip()
-                    if "[[" in line_content and "]]" in line_content:
-                        # Split the line at the [[ delimiter
-                        parts = line_content.split("[[", 1)
-                        # Extract the link type from before [[
-                        link_type_str = parts[0].strip()
-                        # Remove the leading "- " from the link type string
-                        if link_type_str.startswith("- "):
-                            link_type_str = link_type_str[2:].strip()
-                        # Extract target ID and description
-                        id_and_description = parts[1].split("]]", 1)
-                        target_id = id_and_description[0].strip()
-                        description = None
-                        if len(id_and_description) > 1:
-                            description = id_and_description[1].strip()
-                        # Validate link type
-                        try:
-                            link_type = LinkType(link_type_str)
-                        except ValueError:
-                            # If not a valid type, default to reference
-                            link_type = LinkType.REFERENCE
-                        links.append(
-                            Link(
-                                source_id=note_id,
-                                target_id=target_id,
-                                link_type=link_type,
-                                description=description,
-                                created_at=datetime.datetime.now()
-                            )
-                        )
-                except Exception as e:
-                    logger.error(f"Error parsing link: {line} - {e}")
+        # Resolve tag IDs, creating any tags that don't exist yet
+        tag_ids = {} if known_tag_ids is None else known_tag_ids
+        tag_names = {tag.name for note in batch.values() for tag in note.tags}
+        unknown_tags = tag_names - tag_ids.keys()
+        if unknown_tags:
+            tag_ids.update(session.execute(
+                select(DBTag.name, DBTag.id).where(DBTag.name.in_(unknown_tags))
+            ).tuples().all())
+            missing_tags = unknown_tags - tag_ids.keys()
+            if missing_tags:
+                session.execute(insert(DBTag), [{"name": n} for n in missing_tags])
+                tag_ids.update(session.execute(
+                    select(DBTag.name, DBTag.id).where(DBTag.name.in_(missing_tags))
+                ).tuples().all())
         
-        # Extract timestamps
-        created_str = metadata.get("created")
-        created_at = (
-            datetime.datetime.fromisoformat(created_str)
-            if created_str
-            else datetime.datetime.now()
-        )
-        updated_str = metadata.get("updated")
-        updated_at = (
-            datetime.datetime.fromisoformat(updated_str)
-            if updated_str
-            else created_at
-        )
+        note_rows = []
+        note_tag_rows = []
+        link_rows: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        for note in batch.values():
+            note_rows.append({
+                "id": note.id,
+                "title": note.title,
+                "content": note.content,
+                "note_type": note.note_type.value,
+                "created_at": note.created_at,
+                "updated_at": note.updated_at,
+            })
+            for name in dict.fromkeys(tag.name for tag in note.tags):
+                note_tag_rows.append({"note_id": note.id, "tag_id": tag_ids[name]})
+            for link in note.links:
+                # Keep the first of any duplicate links, as the unique
+                # constraint on links requires
+                key = (link.source_id, link.target_id, link.link_type.value)
+                link_rows.setdefault(key, {
+                    "source_id": link.source_id,
+                    "target_id": link.target_id,
+                    "link_type": link.link_type.value,
+                    "description": link.description,
+                    "created_at": link.created_at,
+                })
         
-        # Create note object
-        return Note(
-            id=note_id,
-            title=title,
-            content=post.content,
-            note_type=note_type,
-            tags=tags,
-            links=links,
-            created_at=created_at,
-            updated_at=updated_at,
-            metadata={k: v for k, v in metadata.items() 
-                     if k not in ["id", "title", "type", "tags", "created", "updated"]}
-        )
-    
+        # One executemany per table instead of a statement per row
+        session.execute(insert(DBNote), note_rows)
+        if note_tag_rows:
+            session.execute(insert(note_tags), note_tag_rows)
+        if link_rows:
+            session.execute(insert(DBLink), list(link_rows.values()))
+
     def _index_note(self, note: Note) -> None:
         """Index a note in the database."""
+        # Reuse the bulk path: it replaces any existing rows for the note and
+        # inserts its tags and links with one statement per table, instead of
+        # a lookup and flush for every tag and link
         with self.session_factory() as session:
-            # Create or update note
-            db_note = session.scalar(select(DBNote).where(DBNote.id == note.id))
-            if db_note:
-                # Update existing note
-                db_note.title = note.title
-                db_note.content = note.content
-                db_note.note_type = note.note_type.value
-                db_note.updated_at = note.updated_at
-                # Clear existing links and tags to rebuild them
-                session.execute(text(f"DELETE FROM links WHERE source_id = '{note.id}'"))
-                session.execute(text(f"DELETE FROM note_tags WHERE note_id = '{note.id}'"))
-            else:
-                # Create new note
-                db_note = DBNote(
-                    id=note.id,
-                    title=note.title,
-                    content=note.content,
-                    note_type=note.note_type.value,
-                    created_at=note.created_at,
-                    updated_at=note.updated_at
-                )
-                session.add(db_note)
-                
-            session.flush()  # Flush to get the note ID
-            
-            # Add tags
-            for tag in note.tags:
-                # Check if tag exists
-                db_tag = session.scalar(
-                    select(DBTag).where(DBTag.name == tag.name)
-                )
-                if not db_tag:
-                    db_tag = DBTag(name=tag.name)
-                    session.add(db_tag)
-                    session.flush()  # Flush to get the tag ID
-                db_note.tags.append(db_tag)
-            
-            # Add links
-            for link in note.links:
-                # Check if this link already exists in the database
-                existing_link = session.scalar(
-                    select(DBLink).where(
-                        (DBLink.source_id == link.source_id) &
-                        (DBLink.target_id == link.target_id) &
-                        (DBLink.link_type == link.link_type.value)
-                    )
-                )
-                
-                if not existing_link:
-                    db_link = DBLink(
-                        source_id=link.source_id,
-                        target_id=link.target_id,
-                        link_type=link.link_type.value,
-                        description=link.description,
-                        created_at=link.created_at
-                    )
-                    session.add(db_link)
-            
+            self._index_notes(session, [note])
             # Commit changes
             session.commit()
 
@@ -299,36 +518,76 @@ class NoteRepository(Repository[Note]):
         else:
             content = f"{title_heading}\n\n{note.content}"
         
-        # Remove existing Links section(s)
-        content_parts = []
-        skip_section = False
-        for line in content.split("\n"):
-            if line.strip() == "## Links":
-                skip_section = True
-                continue
-            elif skip_section and line.startswith("## "):
-                skip_section = False
+        # Remove existing Links section(s); the substring check lets notes
+        # without one skip the line-by-line scan
+        if "## Links" in content:
+            content_parts = []
+            skip_section = False
+            for line in content.split("\n"):
+                if line.strip() == "## Links":
+                    skip_section = True
+                    continue
+                elif skip_section and line.startswith("## "):
+                    skip_section = False
+                
+                if not skip_section:
+                    content_parts.append(line)
             
-            if not skip_section:
-                content_parts.append(line)
+            # Reconstruct the content without the Links sections
+            content = "\n".join(content_parts)
         
-        # Reconstruct the content without the Links sections
-        content = "\n".join(content_parts).rstrip()
+        # Collect the file as a list of lines and join once at the end, rather
+        # than growing the content string for every link
+        parts = ["---", _dump_frontmatter(metadata), "---", "", content.rstrip()]
         
         # Add links section (with deduplication)
         if note.links:
             unique_links = {}  # Use dict to deduplicate
             for link in note.links:
-                key = f"{link.target_id}:{link.link_type.value}"
-                unique_links[key] = link
-            content += "\n\n## Links\n"
-            for link in unique_links.values():
-                desc = f" {link.description}" if link.description else ""
-                content += f"- {link.link_type.value} [[{link.target_id}]]{desc}\n"
+                unique_links[(link.target_id, link.link_type)] = link
+            parts.append("")
+            parts.append("## Links")
+            for (target_id, link_type), link in unique_links.items():
+                if link.description:
+                    parts.append(
+                        _LINK_LINE_DESC_TEMPLATES[link_type].format(target_id, link.description)
+                    )
+                else:
+                    parts.append(_LINK_LINE_TEMPLATES[link_type].format(target_id))
         
-        # Create markdown with frontmatter
-        post = frontmatter.Post(content, **metadata)
-        return frontmatter.dumps(post)
+        # Create markdown with frontmatter, in the layout python-frontmatter uses
+        return "\n".join(parts)
+
+    def _write_note_file(self, note_id: str, markdown: str) -> Path:
+        """Write the markdown for a note to its file and return the path."""
+        file_path = self.notes_dir / f"{note_id}.md"
+        # Replace the file a symlinked note points to, not the link itself
+        target_path = file_path.resolve()
+        # Encode once and write the bytes directly, bypassing the text and
+        # buffering layers of open()
+        data = memoryview(markdown.encode("utf-8"))
+        tmp_path = None
+        try:
+            with self.file_lock:
+                # Write to a uniquely named temporary file next to the note
+                # and rename it into place, so an interrupted write never
+                # leaves a truncated note behind and concurrent writers never
+                # share a temporary file. The .tmp suffix keeps it out of the
+                # *.md scans in rebuild_index
+                with tempfile.NamedTemporaryFile(
+                    "wb", buffering=0, dir=target_path.parent,
+                    prefix=f".{note_id}.", suffix=".md.tmp", delete=False
+                ) as tmp_file:
+                    tmp_path = tmp_file.name
+                    while data:
+                        data = data[tmp_file.write(data):]
+                os.chmod(tmp_path, _NOTE_FILE_MODE)
+                os.replace(tmp_path, target_path)
+        except IOError as e:
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+            raise IOError(f"Failed to write note to {file_path}: {e}")
+        return file_path
 
     def create(self, note: Note) -> Note:
         """Create a new note."""
@@ -337,17 +596,9 @@ class NoteRepository(Repository[Note]):
             from zettelkasten_mcp.models.schema import generate_id
             note.id = generate_id()
         
-        # Convert note to markdown
+        # Convert note to markdown and write to file
         markdown = self._note_to_markdown(note)
-        
-        # Write to file
-        file_path = self.notes_dir / f"{note.id}.md"
-        try:
-            with self.file_lock:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(markdown)
-        except IOError as e:
-            raise IOError(f"Failed to write note to {file_path}: {e}")
+        self._write_note_file(note.id, markdown)
         
         # Index in database
         self._index_note(note)
@@ -366,9 +617,7 @@ class NoteRepository(Repository[Note]):
         if not file_path.exists():
             return None
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            return self._parse_note_from_markdown(content)
+            return _parse_note_markdown(_read_note_text(file_path))
         except Exception as e:
             raise IOError(f"Failed to read note {id}: {e}")
     
@@ -383,104 +632,93 @@ class NoteRepository(Repository[Note]):
             return self.get(db_note.id)
     
     def get_all(self) -> List[Note]:
-        """Get all notes."""
+        """Get all notes.
+        Notes are loaded from their files, so queries only select note IDs.
+        """
+        # Ordering by ID walks the primary key index and reads the files in
+        # name order, which keeps results stable between calls
+        all_notes = []
+        for note_id in self.get_all_ids():
+            try:
+                note = self.get(note_id)
+                if note:
+                    all_notes.append(note)
+            except Exception as e:
+                logger.error(f"Error loading note {note_id}: {e}")
+        return all_notes
+    
+    def iter_all(self, batch_size: int = 500) -> Iterator[Note]:
+        """Iterate over all notes, ordered by ID, without loading them all at once.
+        IDs are fetched batch_size at a time with a keyset query on the primary
+        key, so memory stays flat however large the Zettelkasten is.
+        """
+        last_id = None
+        while True:
+            query = select(DBNote.id).order_by(DBNote.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(DBNote.id > last_id)
+            with self.session_factory() as session:
+                note_ids = list(session.scalars(query))
+            for note_id in note_ids:
+                try:
+                    note = self.get(note_id)
+                    if note:
+                        yield note
+                except Exception as e:
+                    logger.error(f"Error loading note {note_id}: {e}")
+            if len(note_ids) < batch_size:
+                return
+            last_id = note_ids[-1]
+    
+    def get_all_ids(self) -> List[str]:
+        """Get the IDs of all notes, ordered by ID."""
         with self.session_factory() as session:
-            # Get all notes with eager loading of tags and links
-            query = select(DBNote).options(
-                joinedload(DBNote.tags),
-                joinedload(DBNote.outgoing_links),
-                joinedload(DBNote.incoming_links)
+            return list(session.scalars(select(DBNote.id).order_by(DBNote.id)))
+    
+    def get_tag_names_by_note(self) -> Dict[str, Set[str]]:
+        """Get the tag names of every tagged note, keyed by note ID."""
+        tags_by_note: Dict[str, Set[str]] = {}
+        with self.session_factory() as session:
+            rows = session.execute(
+                select(note_tags.c.note_id, DBTag.name)
+                .join(DBTag, DBTag.id == note_tags.c.tag_id)
             )
-            result = session.execute(query)
-            # Apply unique() to handle the duplicate rows from eager loading
-            db_notes = result.unique().scalars().all()
-            
-            # Process notes in batches to reduce memory usage
-            batch_size = 50
-            all_notes = []
-            # Create batches of note IDs
-            note_ids = [note.id for note in db_notes]
-            for i in range(0, len(note_ids), batch_size):
-                batch_ids = note_ids[i:i + batch_size]
-                note_batch = []
-                # Process each note in the batch
-                for note_id in batch_ids:
-                    try:
-                        note = self.get(note_id)
-                        if note:
-                            note_batch.append(note)
-                    except Exception as e:
-                        logger.error(f"Error loading note {note_id}: {e}")
-                all_notes.extend(note_batch)
-            return all_notes
+            for note_id, tag_name in rows:
+                tags_by_note.setdefault(note_id, set()).add(tag_name)
+        return tags_by_note
+    
+    def get_link_targets_by_note(self) -> Dict[str, Set[str]]:
+        """Get the IDs each note links to, keyed by source note ID."""
+        targets_by_note: Dict[str, Set[str]] = {}
+        with self.session_factory() as session:
+            rows = session.execute(select(DBLink.source_id, DBLink.target_id))
+            for source_id, target_id in rows:
+                targets_by_note.setdefault(source_id, set()).add(target_id)
+        return targets_by_note
+    
+    def count(self) -> int:
+        """Count the notes in the index without loading them."""
+        with self.session_factory() as session:
+            return session.scalar(select(func.count()).select_from(DBNote)) or 0
     
     def update(self, note: Note) -> Note:
         """Update a note."""
-        # Check if note exists
-        existing_note = self.get(note.id)
-        if not existing_note:
+        # Check if note exists; callers have usually just loaded the note, so
+        # looking for its file avoids reading and parsing it a second time
+        file_path = self.notes_dir / f"{note.id}.md"
+        if not file_path.exists():
             raise ValueError(f"Note with ID {note.id} does not exist")
         
         # Update timestamp
         note.updated_at = datetime.datetime.now()
         
-        # Convert note to markdown
+        # Convert note to markdown and write to file
         markdown = self._note_to_markdown(note)
-        
-        # Write to file
-        file_path = self.notes_dir / f"{note.id}.md"
-        try:
-            with self.file_lock:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(markdown)
-        except IOError as e:
-            raise IOError(f"Failed to write note to {file_path}: {e}")
+        self._write_note_file(note.id, markdown)
         
         try:
-            # Re-index in database
-            with self.session_factory() as session:
-                # Get the existing note from the database
-                db_note = session.scalar(select(DBNote).where(DBNote.id == note.id))
-                if db_note:
-                    # Update the note fields
-                    db_note.title = note.title
-                    db_note.content = note.content
-                    db_note.note_type = note.note_type.value
-                    db_note.updated_at = note.updated_at
-                    
-                    # Clear existing tags
-                    db_note.tags = []
-                    
-                    # Add tags
-                    for tag in note.tags:
-                        # Check if tag exists
-                        db_tag = session.scalar(
-                            select(DBTag).where(DBTag.name == tag.name)
-                        )
-                        if not db_tag:
-                            db_tag = DBTag(name=tag.name)
-                            session.add(db_tag)
-                            session.flush()
-                        db_note.tags.append(db_tag)
-                    
-                    # For links, we'll delete existing links and add the new ones
-                    session.execute(text(f"DELETE FROM links WHERE source_id = '{note.id}'"))
-                    
-                    # Add new links
-                    for link in note.links:
-                        db_link = DBLink(
-                            source_id=link.source_id,
-                            target_id=link.target_id,
-                            link_type=link.link_type.value,
-                            description=link.description,
-                            created_at=link.created_at
-                        )
-                        session.add(db_link)
-                    
-                    session.commit()
-                else:
-                    # This would be unusual, but handle it by creating a new database record
-                    self._index_note(note)
+            # Re-index in database, replacing the note's tags and links
+            self._index_note(note)
         except Exception as e:
             # Log and re-raise the exception
             logger.error(f"Failed to update note in database: {e}")
@@ -504,35 +742,39 @@ class NoteRepository(Repository[Note]):
         
         # Delete from database
         with self.session_factory() as session:
-            # Delete note and its relationships
-            session.execute(text(f"DELETE FROM links WHERE source_id = '{id}' OR target_id = '{id}'"))
-            session.execute(text(f"DELETE FROM note_tags WHERE note_id = '{id}'"))
-            session.execute(text(f"DELETE FROM notes WHERE id = '{id}'"))
+            # Delete note and its relationships. Bound parameters keep the SQL
+            # text the same for every note, so the compiled and prepared
+            # statements are reused, and the two link deletes each use an index
+            session.execute(delete(DBLink).where(DBLink.source_id == id))
+            session.execute(delete(DBLink).where(DBLink.target_id == id))
+            session.execute(note_tags.delete().where(note_tags.c.note_id == id))
+            session.execute(delete(DBNote).where(DBNote.id == id))
             session.commit()
     
     def search(self, **kwargs: Any) -> List[Note]:
         """Search for notes based on criteria."""
         with self.session_factory() as session:
-            query = select(DBNote).options(
-                joinedload(DBNote.tags),
-                joinedload(DBNote.outgoing_links),
-                joinedload(DBNote.incoming_links)
-            )
+            query = select(DBNote.id)
             # Process search criteria
             if "content" in kwargs:
                 search_term = kwargs['content']
+                pattern = _like_pattern(search_term)
                 # Search in both content and title since content might include the title
                 query = query.where(
                     or_(
-                        DBNote.content.like(f"%{search_term}%"),
-                        DBNote.title.like(f"%{search_term}%")
+                        DBNote.content.like(pattern, escape="\\"),
+                        DBNote.title.like(pattern, escape="\\")
                     )
                 )
+                query = self._where_full_text_match(query, search_term)
             if "title" in kwargs:
                 search_title = kwargs['title']
                 # query = query.where(DBNote.title.like(f"%{search_title}%"))
                 # Use case-insensitive search with func.lower()
-                query = query.where(func.lower(DBNote.title).like(f"%{search_title.lower()}%"))
+                query = query.where(
+                    func.lower(DBNote.title).like(_like_pattern(search_title.lower()), escape="\\")
+                )
+                query = self._where_full_text_match(query, search_title, "title")
             if "note_type" in kwargs:
                 note_type = (
                     kwargs["note_type"].value
@@ -540,19 +782,25 @@ class NoteRepository(Repository[Note]):
                     else kwargs["note_type"]
                 )
                 query = query.where(DBNote.note_type == note_type)
+            # Tag and link filters are EXISTS checks rather than joins, so
+            # each note is tested once and can stop at its first match
             if "tag" in kwargs:
                 tag_name = kwargs["tag"]
-                query = query.join(DBNote.tags).where(DBTag.name == tag_name)
+                query = query.where(self._tag_exists(DBTag.name == tag_name))
             if "tags" in kwargs:
                 tag_names = kwargs["tags"]
                 if isinstance(tag_names, list):
-                    query = query.join(DBNote.tags).where(DBTag.name.in_(tag_names))
+                    query = query.where(self._tag_exists(DBTag.name.in_(tag_names)))
             if "linked_to" in kwargs:
                 target_id = kwargs["linked_to"]
-                query = query.join(DBNote.outgoing_links).where(DBLink.target_id == target_id)
+                query = query.where(exists().where(
+                    DBLink.source_id == DBNote.id, DBLink.target_id == target_id
+                ))
             if "linked_from" in kwargs:
                 source_id = kwargs["linked_from"]
-                query = query.join(DBNote.incoming_links).where(DBLink.source_id == source_id)
+                query = query.where(exists().where(
+                    DBLink.target_id == DBNote.id, DBLink.source_id == source_id
+                ))
             if "created_after" in kwargs:
                 query = query.where(DBNote.created_at >= kwargs["created_after"])
             if "created_before" in kwargs:
@@ -561,17 +809,59 @@ class NoteRepository(Repository[Note]):
                 query = query.where(DBNote.updated_at >= kwargs["updated_after"])
             if "updated_before" in kwargs:
                 query = query.where(DBNote.updated_at <= kwargs["updated_before"])
-            # Execute query and apply unique() to handle duplicates from joins
-            result = session.execute(query)
-            db_notes = result.unique().scalars().all()
-        # Load notes from file system
+            if "newest_by" in kwargs:
+                # Newest first on "created" or "updated", so a limit keeps the
+                # latest notes and only those files are read
+                newest_by = kwargs["newest_by"]
+                if newest_by == "created":
+                    query = query.order_by(DBNote.created_at.desc())
+                elif newest_by == "updated":
+                    query = query.order_by(DBNote.updated_at.desc())
+                else:
+                    raise ValueError(
+                        f"Invalid newest_by: {newest_by}. Use 'created' or 'updated'"
+                    )
+            if "limit" in kwargs:
+                query = query.limit(kwargs["limit"])
+            note_ids = session.scalars(query).all()
+        # Load notes from file system, skipping any that fail to load so one
+        # broken file doesn't fail the whole search
         notes = []
-        for db_note in db_notes:
-            note = self.get(db_note.id)
-            if note:
-                notes.append(note)
+        for note_id in note_ids:
+            try:
+                note = self.get(note_id)
+                if note:
+                    notes.append(note)
+            except Exception as e:
+                logger.error(f"Error loading note {note_id}: {e}")
         return notes
     
+    def _tag_exists(self, condition: Any) -> Any:
+        """Build an EXISTS test for a tag of the note matching a condition."""
+        return exists().where(
+            note_tags.c.note_id == DBNote.id,
+            DBTag.id == note_tags.c.tag_id,
+            condition
+        )
+    
+    def _where_full_text_match(
+        self, query: Select, term: str, column: Optional[str] = None
+    ) -> Select:
+        """Narrow a query to notes whose full-text index contains a term.
+        The LIKE conditions still decide what matches; the index only spares
+        them from scanning every note. Terms shorter than three characters,
+        which the trigram index can't look up, are skipped.
+        """
+        if not self.fts_enabled or len(term) < 3:
+            return query
+        phrase = '"' + term.replace('"', '""') + '"'
+        if column:
+            phrase = f"{column} : {phrase}"
+        matches = select(notes_fts.c.rowid).where(
+            literal_column("notes_fts").op("MATCH")(phrase)
+        )
+        return query.where(literal_column("notes.rowid").in_(matches))
+    
     def find_by_tag(self, tag: Union[str, Tag]) -> List[Note]:
         """Find notes by tag."""
         tag_name = tag.name if isinstance(tag, Tag) else tag
@@ -583,62 +873,44 @@ class NoteRepository(Repository[Note]):
             if direction == "outgoing":
                 # Find notes that this note links to
                 query = (
-                    select(DBNote)
+                    select(DBNote.id)
                     .join(DBLink, DBNote.id == DBLink.target_id)
                     .where(DBLink.source_id == note_id)
-                    .options(
-                        joinedload(DBNote.tags),
-                        joinedload(DBNote.outgoing_links),
-                        joinedload(DBNote.incoming_links)
-                    )
                 )
             elif direction == "incoming":
                 # Find notes that link to this note
                 query = (
-                    select(DBNote)
+                    select(DBNote.id)
                     .join(DBLink, DBNote.id == DBLink.source_id)
                     .where(DBLink.target_id == note_id)
-                    .options(
-                        joinedload(DBNote.tags),
-                        joinedload(DBNote.outgoing_links),
-                        joinedload(DBNote.incoming_links)
-                    )
                 )
             elif direction == "both":
-                # Find both directions
-                query = (
-                    select(DBNote)
-                    .join(
-                        DBLink,
-                        or_(
-                            and_(DBNote.id == DBLink.target_id, DBLink.source_id == note_id),
-                            and_(DBNote.id == DBLink.source_id, DBLink.target_id == note_id)
-                        )
-                    )
-                    .options(
-                        joinedload(DBNote.tags),
-                        joinedload(DBNote.outgoing_links),
-                        joinedload(DBNote.incoming_links)
-                    )
+                # Find both directions; a UNION of the two lookups can use the
+                # source and target indexes, where a join on an OR of them
+                # has to scan every link
+                linked_ids = union(
+                    select(DBLink.target_id).where(DBLink.source_id == note_id),
+                    select(DBLink.source_id).where(DBLink.target_id == note_id)
                 )
+                query = select(DBNote.id).where(DBNote.id.in_(linked_ids))
             else:
                 raise ValueError(f"Invalid direction: {direction}. Use 'outgoing', 'incoming', or 'both'")
             
-            result = session.execute(query)
-            # Apply unique() to handle the duplicate rows from eager loading
-            db_notes = result.unique().scalars().all()
+            # DISTINCT drops notes reached through several links
+            note_ids = session.scalars(query.distinct()).all()
             
             # Convert to model Notes
             notes = []
-            for db_note in db_notes:
-                note = self.get(db_note.id)
+            for note_id in note_ids:
+                note = self.get(note_id)
                 if note:
                     notes.append(note)
             return notes
     
     def get_all_tags(self) -> List[Tag]:
         """Get all tags in the system."""
+        # Only the names are needed, so skip building DBTag objects and reuse
+        # the shared Tag instances
         with self.session_factory() as session:
-            result = session.execute(select(DBTag))
-            db_tags = result.scalars().all()
-        return [Tag(name=tag.name) for tag in db_tags]
+            tag_names = session.scalars(select(DBTag.name)).all()
+        return [_get_tag(name) for name in tag_names]